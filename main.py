@@ -1,10 +1,12 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Query
 from fastapi.responses import JSONResponse, FileResponse
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from src.database import init_db, insert_document, get_document, extract_file_text
+from fastapi.concurrency import run_in_threadpool
+from src.database import init_db, insert_document, get_document, extract_file_text, get_document_overviews
 from src.document_analyzer import analyze_document
+from src.similarity_index import get_vector, vectorize, find_similar, start_index_backfill
 import uvicorn
 import json
 import os
@@ -33,8 +35,9 @@ app.mount("/static", StaticFiles(directory="build/static"), name="static")
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize the database on startup"""
+    """Initialize the database and index existing contracts on startup"""
     await init_db()
+    start_index_backfill()
 
 # @app.get("/")
 # async def root():
@@ -114,6 +117,45 @@ async def get_document_info(doc_id: int):
             detail=f"An error occurred: {str(e)}"
         )
 
+@app.get("/api/documents/{doc_id}/similar")
+async def get_similar_documents(doc_id: int, k: int = Query(5, ge=1, le=100)):
+    doc = await get_document(doc_id)
+    if doc is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Document not found"
+        )
+    
+    try:
+        # The index scan is blocking, so keep it off the event loop
+        vector = await run_in_threadpool(get_vector, doc_id)
+        if vector is None:
+            # Fall back to the extracted text if the document has not been indexed yet
+            vector = await run_in_threadpool(vectorize, doc[7] or "")
+        
+        matches = await run_in_threadpool(find_similar, vector, k, doc_id)
+        overviews = {row[0]: row for row in await get_document_overviews([m[0] for m in matches])}
+        
+        return {
+            "id": doc_id,
+            "similar": [
+                {
+                    "id": match_id,
+                    "filename": overviews[match_id][1],
+                    "risk": overviews[match_id][2],
+                    "compliance": bool(overviews[match_id][3]) if overviews[match_id][3] is not None else None,
+                    "score": score
+                }
+                for match_id, score in matches
+                if match_id in overviews
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred: {str(e)}"
+        )
+
 # Custom Error Handlers
 @app.exception_handler(404)
 async def not_found_handler(request: Request, exc: HTTPException):
@@ -7,6 +7,7 @@ import { fetchDocumentData } from '../services/documentService';
 const LoadingScreen = () => {
   const [status, setStatus] = useState(0);
   const [error, setError] = useState(null);
+  const [partial, setPartial] = useState({ contract_summary: null, potential_risks: null });
   const navigate = useNavigate();
   const location = useLocation();
   const { documentId } = useParams();
@@ -48,6 +49,11 @@ const LoadingScreen = () => {
           navigate(`/visualization/${documentId}`);
         } else {
           setStatus(data.status);
+          // Show summary and risks while they are still being generated
+          setPartial({
+            contract_summary: data.contract_summary,
+            potential_risks: data.potential_risks
+          });
         }
       } catch (error) {
         console.error('Error checking status:', error);
@@ -142,6 +148,26 @@ const LoadingScreen = () => {
         >
           Processing: {filename}
         </Typography>
+        {partial.contract_summary && (
+          <Box style={{ marginTop: '2rem', maxWidth: '800px', width: '100%' }}>
+            <Typography variant="subtitle1" style={{ fontWeight: 'bold' }}>
+              Contract Summary
+            </Typography>
+            <Typography variant="body2" style={{ whiteSpace: 'pre-line', color: '#444' }}>
+              {partial.contract_summary}
+            </Typography>
+          </Box>
+        )}
+        {partial.potential_risks && (
+          <Box style={{ marginTop: '1.5rem', maxWidth: '800px', width: '100%' }}>
+            <Typography variant="subtitle1" style={{ fontWeight: 'bold' }}>
+              Potential Risks
+            </Typography>
+            <Typography variant="body2" style={{ whiteSpace: 'pre-line', color: '#444' }}>
+              {partial.potential_risks}
+            </Typography>
+          </Box>
+        )}
       </Box>
     </div>
   );
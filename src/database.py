@@ -9,6 +9,9 @@ from .utils.logger import setup_logger
 
 DATABASE_URL = "contracts.db"
 
+# Text columns that may be filled in incrementally while the LLM is still generating
+STREAMABLE_FIELDS = ("contract_summary", "potential_risks")
+
 # Create logger for this file
 logger = setup_logger('database')
 
@@ -118,6 +121,40 @@ async def get_document(doc_id: int):
         logger.error(f"Error retrieving document {doc_id}: {str(e)}", exc_info=True)
         return None
 
+async def get_document_overviews(doc_ids: List[int]):
+    """Retrieve id, filename, risk and compliance for several documents"""
+    if not doc_ids:
+        return []
+    try:
+        placeholders = ", ".join("?" for _ in doc_ids)
+        async with aiosqlite.connect(DATABASE_URL) as db:
+            cursor = await db.execute(f"""
+                SELECT id, filename, risk, compliance FROM documents WHERE id IN ({placeholders})
+            """, tuple(doc_ids))
+            return await cursor.fetchall()
+    except Exception as e:
+        logger.error(f"Error retrieving documents {doc_ids}: {str(e)}", exc_info=True)
+        return []
+
+async def get_document_text_ids() -> List[int]:
+    """Retrieve the ids of all documents with extracted text"""
+    async with aiosqlite.connect(DATABASE_URL) as db:
+        cursor = await db.execute("""
+            SELECT id FROM documents WHERE file_text IS NOT NULL
+        """)
+        return [row[0] for row in await cursor.fetchall()]
+
+async def get_document_texts(doc_ids: List[int]):
+    """Retrieve (id, file_text) for several documents"""
+    if not doc_ids:
+        return []
+    placeholders = ", ".join("?" for _ in doc_ids)
+    async with aiosqlite.connect(DATABASE_URL) as db:
+        cursor = await db.execute(f"""
+            SELECT id, file_text FROM documents WHERE id IN ({placeholders}) AND file_text IS NOT NULL
+        """, tuple(doc_ids))
+        return await cursor.fetchall()
+
 async def update_document_analysis(
     doc_id: int,
     parties: List[str],
@@ -164,6 +201,24 @@ async def update_document_analysis(
         print(f"Error updating document analysis: {str(e)}")
         return False
 
+async def update_document_partial_text(doc_id: int, field: str, text: str) -> bool:
+    """Store partially generated text for a streamable field of a document"""
+    if field not in STREAMABLE_FIELDS:
+        logger.error(f"Field {field} cannot be updated incrementally")
+        return False
+    try:
+        async with aiosqlite.connect(DATABASE_URL) as db:
+            await db.execute(f"""
+                UPDATE documents 
+                SET {field} = ?
+                WHERE id = ?
+            """, (text, doc_id))
+            await db.commit()
+            return True
+    except Exception as e:
+        logger.error(f"Error updating partial {field}: {str(e)}", exc_info=True)
+        return False
+
 async def update_document_status(doc_id: int, status: int) -> bool:
     """Update the document status in the database"""
     try:
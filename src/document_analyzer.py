@@ -1,5 +1,6 @@
 import threading
 import asyncio
+import time
 from typing import Literal
 from typing_extensions import TypedDict
 from langchain_core.messages import HumanMessage
@@ -16,8 +17,10 @@ from .database import (
     update_document_analysis, 
     get_document, 
     extract_file_text, 
-    update_document_status
+    update_document_status,
+    update_document_partial_text
 )
+from .similarity_index import add_document
 import aiosqlite
 import io
 from .utils.logger import setup_logger
@@ -31,6 +34,9 @@ vertexai.init(project=PROJECT_ID, location=LOCATION, staging_bucket=STAGING_BUCK
 # Create logger for this file
 logger = setup_logger('document_analyzer')
 
+# Minimum seconds between partial writes while streaming a response
+STREAM_WRITE_INTERVAL = 0.5
+
 class UsefulInformation(BaseModel):
     parties_involved: list[str] = Field(description="A list of only the names of the parties involved in the contract")
     effective_dates: list[str] = Field(description="A list containing only the effective start and end dates of the contract")
@@ -81,6 +87,40 @@ async def extract_information(text_content: str, doc_id: int) -> UsefulInformati
             compliance_requirements=[]
         )
 
+async def stream_response(chat, prompt: str, doc_id: int, field: str) -> str:
+    """Stream a chat response, persisting the partial text to the document as chunks arrive"""
+    text = ""
+    last_write = 0.0
+    written = ""
+    try:
+        for chunk in chat.send_message(prompt, stream=True):
+            # Chunks carrying only a finish or safety reason have no text
+            if not chunk.candidates or not chunk.candidates[0].content.parts:
+                continue
+            text += chunk.text
+
+            # Throttle writes so the database is not hit for every chunk
+            now = time.monotonic()
+            if now - last_write >= STREAM_WRITE_INTERVAL:
+                await update_document_partial_text(doc_id, field, text)
+                last_write = now
+                written = text
+    except Exception as e:
+        # Keep whatever was already streamed rather than discarding it
+        if not text:
+            raise
+        logger.error(f"Stream for {field} of document {doc_id} failed, keeping partial text: {str(e)}", exc_info=True)
+
+    # A fully blocked response streams no text at all; let the caller fall back
+    if not text:
+        raise ValueError(f"No text streamed for {field} of document {doc_id}")
+
+    # Make sure the complete response is stored
+    if text != written:
+        await update_document_partial_text(doc_id, field, text)
+
+    return text
+
 # Compliance Check Tools
 @tool
 def check_compliance(doc_id: int) -> str:
@@ -160,8 +200,7 @@ async def summarize(text_content: str, doc_id: int) -> str:
     try:
         model = GenerativeModel("gemini-1.5-pro")
         chat = model.start_chat()
-        response = chat.send_message(prompt)
-        summary = response.text
+        summary = await stream_response(chat, prompt, doc_id, "contract_summary")
 
         # Update status using new function
         await update_document_status(doc_id, 3)
@@ -191,8 +230,7 @@ async def potential_risk_finder(text_content: str, doc_id: int) -> str:
     try:
         model = GenerativeModel("gemini-1.5-pro")
         chat = model.start_chat()
-        response = chat.send_message(prompt)
-        risks = response.text
+        risks = await stream_response(chat, prompt, doc_id, "potential_risks")
 
         # Update status using new function
         await update_document_status(doc_id, 4)
@@ -267,6 +305,9 @@ async def analyze_document(doc_id: int):
                     contract_summary=contract_summary,
                     potential_risks=potential_risks
                 )
+                
+                # Add to the similar-contract index
+                add_document(doc_id, text_content)
                 logger.info(f"Completed analysis for document {doc_id}")
             
             # Run the async function in the thread's event loop
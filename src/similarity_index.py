@@ -0,0 +1,142 @@
+import os
+import re
+import threading
+import asyncio
+import zlib
+import numpy as np
+from typing import List, Optional, Tuple
+from .database import get_document_text_ids, get_document_texts
+from .utils.logger import setup_logger
+
+INDEX_PATH = "contract_vectors.f32"
+
+# Number of hashed features per contract vector
+VECTOR_DIM = 1024
+
+# Rows scored per batch when searching the index
+SEARCH_BATCH_SIZE = 65536
+
+# Documents loaded per query when backfilling, below SQLite's variable limit
+BACKFILL_BATCH_SIZE = 500
+
+# Create logger for this file
+logger = setup_logger('similarity_index')
+
+_write_lock = threading.Lock()
+
+def vectorize(text: str) -> np.ndarray:
+    """Turn contract text into an L2-normalised hashed unigram/bigram vector"""
+    tokens = re.findall(r"[a-z0-9]+", text.lower())
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    vector = np.zeros(VECTOR_DIM, dtype=np.float32)
+    if not features:
+        return vector
+
+    hashes = np.array([zlib.crc32(f.encode()) for f in features], dtype=np.uint32)
+    buckets = (hashes % VECTOR_DIM).astype(np.int64)
+    # Use one hash bit as a sign so bucket collisions tend to cancel out
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+    counts = np.bincount(buckets, weights=signs, minlength=VECTOR_DIM)
+
+    # Sublinear term frequency keeps boilerplate-heavy contracts from dominating
+    vector = (np.sign(counts) * np.log1p(np.abs(counts))).astype(np.float32)
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+def add_document(doc_id: int, text: str) -> bool:
+    """Store the vector for a document at row doc_id of the index file"""
+    try:
+        vector = vectorize(text)
+        with _write_lock:
+            # Create without truncating, another process may be writing rows too
+            fd = os.open(INDEX_PATH, os.O_RDWR | os.O_CREAT)
+            try:
+                os.lseek(fd, doc_id * VECTOR_DIM * vector.itemsize, os.SEEK_SET)
+                os.write(fd, vector.tobytes())
+            finally:
+                os.close(fd)
+        logger.info(f"Indexed document {doc_id} for similarity search")
+        return True
+    except Exception as e:
+        logger.error(f"Error indexing document {doc_id}: {str(e)}", exc_info=True)
+        return False
+
+def _load_index():
+    """Memory-map the index file, or return None if nothing has been indexed"""
+    if not os.path.exists(INDEX_PATH):
+        return None
+    # Only map whole rows, the file may be mid-extension by add_document
+    rows = os.path.getsize(INDEX_PATH) // (VECTOR_DIM * np.dtype(np.float32).itemsize)
+    if rows == 0:
+        return None
+    return np.memmap(INDEX_PATH, dtype=np.float32, mode="r", shape=(rows, VECTOR_DIM))
+
+def get_vector(doc_id: int):
+    """Return the indexed vector for a document, or None if it has not been indexed"""
+    index = _load_index()
+    if index is None or doc_id >= index.shape[0]:
+        return None
+    vector = np.array(index[doc_id])
+    return vector if vector.any() else None
+
+def find_similar(vector: np.ndarray, k: int = 5, exclude_id: Optional[int] = None) -> List[Tuple[int, float]]:
+    """Return up to k (doc_id, cosine similarity) pairs, most similar first"""
+    index = _load_index()
+    if index is None or k <= 0:
+        return []
+
+    best_ids = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0, dtype=np.float32)
+    for start in range(0, index.shape[0], SEARCH_BATCH_SIZE):
+        # Rows are already normalised, so the dot product is the cosine similarity
+        scores = index[start:start + SEARCH_BATCH_SIZE] @ vector
+        ids = np.arange(start, start + scores.shape[0])
+        if exclude_id is not None and start <= exclude_id < start + scores.shape[0]:
+            scores[exclude_id - start] = 0.0
+
+        if scores.shape[0] > k:
+            top = np.argpartition(scores, -k)[-k:]
+            scores, ids = scores[top], ids[top]
+
+        best_ids = np.concatenate([best_ids, ids])
+        best_scores = np.concatenate([best_scores, scores])
+        if best_scores.shape[0] > k:
+            top = np.argpartition(best_scores, -k)[-k:]
+            best_ids, best_scores = best_ids[top], best_scores[top]
+
+    order = np.argsort(-best_scores)
+    # Empty rows (ids never indexed) and unrelated contracts score zero
+    return [
+        (int(best_ids[i]), float(best_scores[i]))
+        for i in order
+        if best_scores[i] > 0
+    ]
+
+async def backfill_index() -> int:
+    """Index every document with extracted text that has no vector yet"""
+    index = _load_index()
+    indexed = set(np.flatnonzero(index.any(axis=1)).tolist()) if index is not None else set()
+    del index
+
+    # Only load the text of documents that are missing from the index
+    missing = [doc_id for doc_id in await get_document_text_ids() if doc_id not in indexed]
+    count = 0
+    for start in range(0, len(missing), BACKFILL_BATCH_SIZE):
+        for doc_id, text in await get_document_texts(missing[start:start + BACKFILL_BATCH_SIZE]):
+            if add_document(doc_id, text):
+                count += 1
+    logger.info(f"Backfilled {count} documents into the similarity index")
+    return count
+
+def start_index_backfill():
+    """Run backfill_index in a background thread"""
+    def backfill_worker():
+        try:
+            asyncio.run(backfill_index())
+        except Exception as e:
+            logger.error(f"Error backfilling similarity index: {str(e)}", exc_info=True)
+
+    thread = threading.Thread(target=backfill_worker, daemon=True)
+    thread.start()
@@ -35,4 +35,10 @@ async def test_upload_pdf_valid():
 async def test_get_document_not_found():
     async with httpx.AsyncClient() as client:
         response = await client.get(f"{BASE_URL}/api/documents/99999")  # Assuming this ID doesn't exist
-    assert response.status_code in [404, 500]
\ No newline at end of file
+    assert response.status_code in [404, 500]
+
+@pytest.mark.asyncio
+async def test_get_similar_documents_not_found():
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{BASE_URL}/api/documents/99999/similar")  # Assuming this ID doesn't exist
+    assert response.status_code in [404, 500]
@@ -0,0 +1,116 @@
+import pytest
+from types import SimpleNamespace
+from src import document_analyzer, database
+
+def make_chunk(text):
+    parts = [SimpleNamespace(text=text)] if text is not None else []
+    return SimpleNamespace(text=text, candidates=[SimpleNamespace(content=SimpleNamespace(parts=parts))])
+
+class FakeChat:
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+
+    def send_message(self, prompt, stream=False):
+        assert stream
+        for chunk in self.chunks:
+            yield chunk
+        if self.error:
+            raise self.error
+
+@pytest.fixture
+def writes(monkeypatch):
+    calls = []
+
+    async def fake_update(doc_id, field, text):
+        calls.append((doc_id, field, text))
+        return True
+
+    monkeypatch.setattr(document_analyzer, "update_document_partial_text", fake_update)
+    return calls
+
+def set_clock(monkeypatch, times):
+    times = iter(times)
+    # Replace only the analyzer's clock; the event loop also uses time.monotonic
+    monkeypatch.setattr(document_analyzer, "time", SimpleNamespace(monotonic=lambda: next(times)))
+
+@pytest.mark.asyncio
+async def test_stream_response_writes_first_chunk_immediately(monkeypatch, writes):
+    set_clock(monkeypatch, [100.0])
+    chat = FakeChat([make_chunk("Hello")])
+    text = await document_analyzer.stream_response(chat, "prompt", 1, "contract_summary")
+    assert text == "Hello"
+    assert writes == [(1, "contract_summary", "Hello")]
+
+@pytest.mark.asyncio
+async def test_stream_response_throttles_writes(monkeypatch, writes):
+    interval = document_analyzer.STREAM_WRITE_INTERVAL
+    set_clock(monkeypatch, [100.0, 100.0 + interval / 2, 100.0 + interval, 100.0 + interval * 1.5])
+    chat = FakeChat([make_chunk("a"), make_chunk("b"), make_chunk("c"), make_chunk("d")])
+    text = await document_analyzer.stream_response(chat, "prompt", 1, "potential_risks")
+    assert text == "abcd"
+    # First chunk, first chunk after the interval, then the final flush
+    assert [call[2] for call in writes] == ["a", "abc", "abcd"]
+
+@pytest.mark.asyncio
+async def test_stream_response_skips_final_flush_when_up_to_date(monkeypatch, writes):
+    interval = document_analyzer.STREAM_WRITE_INTERVAL
+    set_clock(monkeypatch, [100.0, 100.0 + interval])
+    chat = FakeChat([make_chunk("a"), make_chunk("b")])
+    await document_analyzer.stream_response(chat, "prompt", 1, "contract_summary")
+    assert [call[2] for call in writes] == ["a", "ab"]
+
+@pytest.mark.asyncio
+async def test_stream_response_skips_chunks_without_parts(monkeypatch, writes):
+    set_clock(monkeypatch, [100.0])
+    chat = FakeChat([make_chunk("Hello"), make_chunk(None)])
+    text = await document_analyzer.stream_response(chat, "prompt", 1, "contract_summary")
+    assert text == "Hello"
+
+@pytest.mark.asyncio
+async def test_stream_response_raises_when_every_chunk_is_blocked(monkeypatch, writes):
+    chat = FakeChat([make_chunk(None)])
+    with pytest.raises(ValueError):
+        await document_analyzer.stream_response(chat, "prompt", 1, "contract_summary")
+    assert writes == []
+
+@pytest.mark.asyncio
+async def test_summarize_falls_back_when_response_blocked(monkeypatch, writes):
+    monkeypatch.setattr(document_analyzer, "GenerativeModel", lambda name: SimpleNamespace(start_chat=lambda: FakeChat([make_chunk(None)])))
+    assert await document_analyzer.summarize("text", 1) == "No summary"
+    assert await document_analyzer.potential_risk_finder("text", 1) == "No risks identified"
+
+@pytest.mark.asyncio
+async def test_stream_response_keeps_partial_text_on_failure(monkeypatch, writes):
+    set_clock(monkeypatch, [100.0, 100.1])
+    chat = FakeChat([make_chunk("a"), make_chunk("b")], error=RuntimeError("stream broke"))
+    text = await document_analyzer.stream_response(chat, "prompt", 1, "contract_summary")
+    assert text == "ab"
+    assert writes[-1] == (1, "contract_summary", "ab")
+
+@pytest.mark.asyncio
+async def test_stream_response_raises_when_nothing_streamed(monkeypatch, writes):
+    chat = FakeChat([], error=RuntimeError("stream broke"))
+    with pytest.raises(RuntimeError):
+        await document_analyzer.stream_response(chat, "prompt", 1, "contract_summary")
+    assert writes == []
+
+@pytest.mark.asyncio
+async def test_update_document_partial_text(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, "DATABASE_URL", str(tmp_path / "contracts.db"))
+    await database.init_db()
+    doc_id = await database.insert_document("test.pdf", "application/pdf", b"%PDF-1.4")
+
+    assert await database.update_document_partial_text(doc_id, "contract_summary", "Partial")
+    doc = await database.get_document(doc_id)
+    assert doc[15] == "Partial"
+
+@pytest.mark.asyncio
+async def test_update_document_partial_text_rejects_other_fields(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, "DATABASE_URL", str(tmp_path / "contracts.db"))
+    await database.init_db()
+    doc_id = await database.insert_document("test.pdf", "application/pdf", b"%PDF-1.4")
+
+    assert not await database.update_document_partial_text(doc_id, "file_text", "Injected")
+    doc = await database.get_document(doc_id)
+    assert doc[7] is None
@@ -0,0 +1,108 @@
+import pytest
+import aiosqlite
+import numpy as np
+from src import similarity_index, database
+
+@pytest.fixture
+def index_path(monkeypatch, tmp_path):
+    path = tmp_path / "contract_vectors.f32"
+    monkeypatch.setattr(similarity_index, "INDEX_PATH", str(path))
+    return path
+
+def test_vectorize_is_normalised():
+    vector = similarity_index.vectorize("The Licensee shall comply with GDPR requirements.")
+    assert vector.dtype == np.float32
+    assert vector.shape == (similarity_index.VECTOR_DIM,)
+    assert np.linalg.norm(vector) == pytest.approx(1.0, abs=1e-5)
+
+def test_vectorize_empty_text():
+    vector = similarity_index.vectorize("  ... ")
+    assert not vector.any()
+
+def test_add_document_round_trip(index_path):
+    assert similarity_index.add_document(3, "software licence agreement")
+    vector = similarity_index.get_vector(3)
+    np.testing.assert_array_equal(vector, similarity_index.vectorize("software licence agreement"))
+
+    # Rows before the indexed one exist in the file but were never written
+    assert similarity_index.get_vector(1) is None
+    # Rows past the end of the file
+    assert similarity_index.get_vector(10) is None
+
+def test_add_document_keeps_existing_rows(index_path):
+    similarity_index.add_document(1, "software licence agreement")
+    similarity_index.add_document(2, "office lease")
+    assert similarity_index.get_vector(1) is not None
+    assert similarity_index.get_vector(2) is not None
+
+def test_get_vector_without_index(index_path):
+    assert similarity_index.get_vector(1) is None
+    assert similarity_index.find_similar(similarity_index.vectorize("anything")) == []
+
+def test_load_index_ignores_partial_row(index_path):
+    similarity_index.add_document(1, "software licence agreement")
+    with open(index_path, "ab") as f:
+        f.write(b"\x00" * 10)
+    index = similarity_index._load_index()
+    assert index.shape == (2, similarity_index.VECTOR_DIM)
+
+def test_find_similar_orders_and_excludes(index_path):
+    similarity_index.add_document(1, "cloud hosting service agreement with uptime guarantees")
+    similarity_index.add_document(2, "cloud hosting service agreement with uptime guarantees and support")
+    similarity_index.add_document(3, "office lease for warehouse space")
+    similarity_index.add_document(4, "cloud hosting agreement")
+
+    query = similarity_index.get_vector(1)
+    matches = similarity_index.find_similar(query, k=2, exclude_id=1)
+    assert [doc_id for doc_id, _ in matches] == [2, 4]
+    assert matches[0][1] >= matches[1][1]
+
+def test_find_similar_k_larger_than_index(index_path):
+    similarity_index.add_document(1, "cloud hosting service agreement")
+    similarity_index.add_document(2, "cloud hosting support agreement")
+    matches = similarity_index.find_similar(similarity_index.get_vector(1), k=50)
+    # Unindexed row 0 is never returned
+    assert sorted(doc_id for doc_id, _ in matches) == [1, 2]
+    assert matches[0] == (1, pytest.approx(1.0, abs=1e-5))
+
+def test_find_similar_across_batches(index_path, monkeypatch):
+    # Each contract shares one more clause with the query than the previous one
+    clauses = [f"clause{i}" for i in range(12)]
+    for doc_id in range(1, 12):
+        similarity_index.add_document(doc_id, " ".join(clauses[:doc_id]))
+    query = similarity_index.vectorize(" ".join(clauses[:7]))
+
+    expected = similarity_index.find_similar(query, k=4)
+    monkeypatch.setattr(similarity_index, "SEARCH_BATCH_SIZE", 3)
+    batched = similarity_index.find_similar(query, k=4)
+
+    assert [doc_id for doc_id, _ in batched] == [doc_id for doc_id, _ in expected]
+    assert batched[0][0] == 7
+    assert [score for _, score in batched] == pytest.approx([score for _, score in expected])
+
+@pytest.mark.asyncio
+async def test_backfill_index(index_path, monkeypatch, tmp_path):
+    monkeypatch.setattr(database, "DATABASE_URL", str(tmp_path / "contracts.db"))
+    await database.init_db()
+    first = await database.insert_document("a.pdf", "application/pdf", b"%PDF-1.4")
+    second = await database.insert_document("b.pdf", "application/pdf", b"%PDF-1.4")
+    await database.insert_document("c.pdf", "application/pdf", b"%PDF-1.4")
+
+    async with aiosqlite.connect(database.DATABASE_URL) as db:
+        await db.execute("UPDATE documents SET file_text = ? WHERE id IN (?, ?)", ("cloud hosting agreement", first, second))
+        await db.commit()
+
+    similarity_index.add_document(first, "cloud hosting agreement")
+
+    loaded = []
+    get_texts = similarity_index.get_document_texts
+    async def tracking_get_texts(doc_ids):
+        loaded.extend(doc_ids)
+        return await get_texts(doc_ids)
+    monkeypatch.setattr(similarity_index, "get_document_texts", tracking_get_texts)
+
+    assert await similarity_index.backfill_index() == 1
+    # Text is only loaded for documents missing from the index
+    assert loaded == [second]
+    assert similarity_index.get_vector(second) is not None
+    assert await similarity_index.backfill_index() == 0